@@ -1,11 +1,23 @@
 import os
 import json
+import time
+import queue
+import random
+import asyncio
+import hashlib
 import threading
+import aiohttp
 import requests
-from datetime import datetime
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from flask import Flask, jsonify
-from bs4 import BeautifulSoup
+from lxml import etree
+from selectolax.parser import HTMLParser
 from pymongo import MongoClient
+from pymongo.errors import BulkWriteError
 
 try:
     import offreBot  # Assurez-vous que ce fichier existe dans le projet
@@ -27,15 +39,76 @@ if not MISTRAL_API_KEY:
 
 app = Flask(__name__)
 
+# Sélecteurs construits une seule fois au chargement du module
+_JOB_CARD_SELECTOR = "div.Cols3 div.Cols3_item"
+_STRIP_TAGS = frozenset({"script", "style", "noscript", "iframe", "meta", "header", "footer"})
+_BODY_TEXT_XPATH = (
+    "//body//text()["
+    + " and ".join(f"not(ancestor::{tag})" for tag in sorted(_STRIP_TAGS))
+    + "]"
+)
+
+class HostRateLimiter:
+    """Limiteur de débit par hôte : impose un délai (avec gigue) entre requêtes.
+
+    Évite de déclencher les protections anti-DOS du site scrapé une fois
+    les requêtes parallélisées. Les délais se règlent par variables
+    d'environnement SCRAPE_RATE_MIN_DELAY_MS / SCRAPE_RATE_MAX_DELAY_MS.
+    """
+
+    def __init__(self, min_delay_ms, max_delay_ms):
+        self._min_delay = min_delay_ms / 1000
+        self._max_delay = max(max_delay_ms, min_delay_ms) / 1000
+        self._lock = threading.Lock()
+        self._next_at = {}
+
+    def wait(self, url):
+        """Bloque jusqu'au prochain créneau autorisé pour l'hôte de `url`."""
+        host = urlparse(url).netloc
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                next_at = self._next_at.get(host, 0.0)
+                if now >= next_at:
+                    self._next_at[host] = now + random.uniform(self._min_delay, self._max_delay)
+                    return
+                delay = next_at - now
+            time.sleep(delay)
+
 class JobScraper:
     """Scraper pour récupérer les offres d'emploi et les stocker dans MongoDB."""
 
+    MAX_WORKERS = 8
+    SUMMARY_BATCH_SIZE = 4
+    # Seuils du chemin "carte seule" : titre assez descriptif pour tenter un
+    # résumé sans re-télécharger la page, et longueur minimale du résultat
+    CARD_TITLE_MIN_LEN = 25
+    CARD_SUMMARY_MIN_LEN = 150
+    CARD_SENTINEL = "CONTEXTE_INSUFFISANT"
+    # Budget d'entrée LLM : ~2000 tokens à ~4 caractères par token
+    OFFER_TEXT_MAX_CHARS = 8000
+
     def __init__(self, url, mongo_uri, db_name, collection_name):
         self.url = url
         self.headers = {"User-Agent": "Mozilla/5.0"}
-        self.client = MongoClient(mongo_uri, tls=True, tlsAllowInvalidCertificates=True)
+        self._thread_local = threading.local()
+        self._rate_limiter = HostRateLimiter(
+            min_delay_ms=int(os.environ.get("SCRAPE_RATE_MIN_DELAY_MS", "500")),
+            max_delay_ms=int(os.environ.get("SCRAPE_RATE_MAX_DELAY_MS", "1000")),
+        )
+        self.client = MongoClient(
+            mongo_uri,
+            tls=True,
+            maxPoolSize=20,
+            minPoolSize=2,
+            maxIdleTimeMS=30000,
+            serverSelectionTimeoutMS=5000,
+            retryWrites=True,
+            w="majority",
+        )
         self.db = self.client[db_name]
         self.collection = self.db[collection_name]
+        self.summary_cache = self.db["summary_cache"]
 
         # Vérification connexion MongoDB
         try:
@@ -45,10 +118,44 @@ class JobScraper:
             print(f"❌ Erreur de connexion à MongoDB : {e}")
             exit(1)
 
+        # Index unique sur l'URL : dédoublonnage garanti côté serveur
+        self.collection.create_index("url", unique=True)
+        # Cache de résumés expirant après 30 jours (les offres sont souvent republiées à l'identique)
+        self.summary_cache.create_index("ts", expireAfterSeconds=30 * 24 * 3600)
+
+    def _get_session(self):
+        """Retourne une session HTTP propre au thread courant (réutilise TCP+TLS)."""
+        session = getattr(self._thread_local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=32,
+                max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(self.headers)
+            self._thread_local.session = session
+        return session
+
+    def _get_body_text_xpath(self):
+        """Retourne l'évaluateur XPath compilé du thread courant.
+
+        Les évaluateurs lxml ne se partagent pas entre threads ; chacun
+        compile le sien une seule fois.
+        """
+        xpath = getattr(self._thread_local, "body_text_xpath", None)
+        if xpath is None:
+            xpath = etree.XPath(_BODY_TEXT_XPATH)
+            self._thread_local.body_text_xpath = xpath
+        return xpath
+
     def fetch_html(self):
         """Récupère le HTML de la page web."""
         try:
-            response = requests.get(self.url, headers=self.headers)
+            self._rate_limiter.wait(self.url)
+            response = self._get_session().get(self.url)
             response.raise_for_status()
             return response.text
         except requests.RequestException as e:
@@ -56,48 +163,123 @@ class JobScraper:
             return None
 
     def extract_jobs_from_html(self, html):
-        """Extrait les offres d'emploi avec BeautifulSoup."""
-        soup = BeautifulSoup(html, "html.parser")
+        """Extrait les offres d'emploi avec selectolax."""
+        tree = HTMLParser(html)
         jobs = []
 
-        for cols3_div in soup.find_all("div", class_="Cols3"):
-            for job_card in cols3_div.find_all("div", class_="Cols3_item"):
-                title_element = job_card.find("p")
-                company_location = job_card.find("a").text.strip().split("\n")
-
-                title = title_element.text.strip() if title_element else "N/A"
-                company = company_location[0].strip() if len(company_location) > 0 else "N/A"
-                location = company_location[1].strip() if len(company_location) > 1 else "N/A"
-                link_element = job_card.find("a")
-                link = "https://www.mediacongo.net/" + link_element["href"] if link_element else "N/A"
-
-                jobs.append({
-                    "title": title,
-                    "company": company,
-                    "location": location,
-                    "url": link
-                })
+        for job_card in tree.css(_JOB_CARD_SELECTOR):
+            title_element = job_card.css_first("p")
+            link_element = job_card.css_first("a")
+            company_location = link_element.text(separator="\n", strip=True).split("\n") if link_element else []
+
+            title = title_element.text(strip=True) if title_element else "N/A"
+            company = company_location[0].strip() if len(company_location) > 0 else "N/A"
+            location = company_location[1].strip() if len(company_location) > 1 else "N/A"
+            link = "https://www.mediacongo.net/" + link_element.attributes.get("href", "") if link_element else "N/A"
+
+            jobs.append({
+                "title": title,
+                "company": company,
+                "location": location,
+                "url": link,
+                # Offre signalée close/expirée sur la liste : inutile d'aller
+                # chercher sa page, elle répondra 404/410
+                "skip": job_card.css_first(".expired, .closed") is not None,
+            })
         return jobs
 
     def extract_full_text(self, url):
         """Récupère et nettoie tout le texte d'une offre d'emploi."""
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
+            self._rate_limiter.wait(url)
+            # Sonde HEAD d'abord : une offre morte (404/410) se détecte sans
+            # télécharger ni parser la page
+            probe = self._get_session().head(url, allow_redirects=True, timeout=3)
+            if probe.status_code >= 400:
+                print(f"⚠️ Offre inaccessible (HTTP {probe.status_code}), ignorée : {url}")
+                return None
 
-            for tag in soup(["script", "style", "noscript", "iframe", "meta", "header", "footer"]):
-                tag.extract()
+            # Flux HTTP passé directement au parseur lxml : pas de chaîne
+            # intermédiaire ni d'arbre complet à élaguer après coup
+            with self._get_session().get(url, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                parser = etree.HTMLParser(encoding=response.encoding or "utf-8")
+                tree = etree.parse(response.raw, parser)
 
-            return soup.get_text(separator="\n", strip=True)
+            texts = self._get_body_text_xpath()(tree)
+            return "\n".join(t.strip() for t in texts if t.strip())
         except requests.RequestException as e:
             print(f"❌ Erreur lors de l'extraction du texte : {e}")
             return None
 
+    def _cache_get(self, text):
+        """Retourne le résumé en cache pour ce texte, ou None."""
+        cache_key = hashlib.sha256(text.encode()).hexdigest()
+        try:
+            cached = self.summary_cache.find_one({"_id": cache_key})
+            if cached:
+                return cached["resume"]
+        except Exception as e:
+            print(f"⚠️ Cache de résumés indisponible : {e}")
+        return None
+
+    def _cache_put(self, text, resume):
+        """Enregistre un résumé dans le cache."""
+        cache_key = hashlib.sha256(text.encode()).hexdigest()
+        try:
+            self.summary_cache.replace_one(
+                {"_id": cache_key},
+                {"_id": cache_key, "resume": resume, "ts": datetime.now(timezone.utc)},
+                upsert=True,
+            )
+        except Exception as e:
+            print(f"⚠️ Impossible d'écrire dans le cache de résumés : {e}")
+
+    def _trim_offer_text(self, text):
+        """Réduit le texte d'une offre à son bloc principal avant l'appel LLM.
+
+        Les pages mediacongo gardent menus, offres liées et restes de pied
+        de page même après le nettoyage des balises ; chaque caractère
+        envoyé coûte latence et tokens. On repère la plus grande suite de
+        lignes « denses » (le corps de l'offre), on conserve quelques lignes
+        de contexte autour, puis on tronque au budget OFFER_TEXT_MAX_CHARS.
+        """
+        lines = text.split("\n")
+        best = (0, 0, 0)  # (taille, début, fin)
+        start, size = None, 0
+        for i, line in enumerate(lines + [""]):
+            if len(line.strip()) >= 30:
+                if start is None:
+                    start = i
+                size += len(line)
+            else:
+                if start is not None and size > best[0]:
+                    best = (size, start, i)
+                start, size = None, 0
+
+        if best[0] >= 300:
+            lo = max(0, best[1] - 10)
+            hi = min(len(lines), best[2] + 10)
+            trimmed = "\n".join(lines[lo:hi])
+        else:
+            trimmed = text
+        trimmed = trimmed[:self.OFFER_TEXT_MAX_CHARS]
+
+        saved = len(text) - len(trimmed)
+        if saved > 0:
+            print(f"📉 Texte de l'offre réduit de {saved} caractères avant l'appel LLM.")
+        return trimmed
+
     def summarize_with_mistral(self, text):
-        """Appelle l'API de Mistral pour résumer l'offre d'emploi."""
+        """Appelle l'API de Mistral pour résumer l'offre d'emploi (avec cache)."""
+        cached = self._cache_get(text)
+        if cached:
+            print("✅ Résumé trouvé dans le cache, appel Mistral évité.")
+            return cached
+
         try:
-            response = requests.post(
+            response = self._get_session().post(
                 url="https://openrouter.ai/api/v1/chat/completions",
                 headers={
                     "Authorization": f"Bearer {MISTRAL_API_KEY}",
@@ -105,7 +287,16 @@ class JobScraper:
                 },
                 data=json.dumps({
                     "model": "mistralai/mistral-small-24b-instruct-2501:free",
-                    "messages": [{"role": "user", "content": f'{offreBot.SCRIPT} \n {text}'}]
+                    # Préfixe statique en premier et marqué cache_control pour
+                    # que le fournisseur ne refacture pas le prompt à chaque offre
+                    "messages": [{
+                        "role": "user",
+                        "content": [
+                            {"type": "text", "text": offreBot.SCRIPT, "cache_control": {"type": "ephemeral"}},
+                            {"type": "text", "text": text},
+                        ],
+                    }],
+                    "provider": {"order": ["Mistral"]},
                 })
             )
 
@@ -115,7 +306,9 @@ class JobScraper:
                 print("❌ Erreur: L'API Mistral ne contient pas 'choices'.")
                 return None
 
-            return response_data['choices'][0]['message']['content']
+            resume = response_data['choices'][0]['message']['content']
+            self._cache_put(text, resume)
+            return resume
         except requests.exceptions.JSONDecodeError:
             print("❌ Erreur: L'API Mistral a renvoyé un JSON invalide.")
             return None
@@ -123,6 +316,86 @@ class JobScraper:
             print(f"❌ Erreur inattendue lors de l'appel à Mistral : {e}")
             return None
 
+    def _batch_payload(self, texts):
+        """Construit le corps de requête Mistral pour un lot d'offres."""
+        blocks = "\n\n".join(f"=== OFFRE {i + 1} ===\n{text}" for i, text in enumerate(texts))
+        instruction = (
+            f"Tu vas recevoir {len(texts)} offres d'emploi séparées par des marqueurs === OFFRE n ===.\n"
+            'Réponds uniquement avec un objet JSON de la forme {"resumes": ["...", "..."]} '
+            "contenant un résumé par offre, dans le même ordre."
+        )
+        return {
+            "model": "mistralai/mistral-small-24b-instruct-2501:free",
+            "messages": [{
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": offreBot.SCRIPT, "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": f"{instruction}\n\n{blocks}"},
+                ],
+            }],
+            "provider": {"order": ["Mistral"]},
+            "response_format": {"type": "json_object"},
+        }
+
+    async def _summarize_batch_async(self, session, semaphore, texts):
+        """Résume un lot d'offres en un appel Mistral (None si inexploitable)."""
+        try:
+            async with semaphore:
+                async with session.post(
+                    "https://openrouter.ai/api/v1/chat/completions",
+                    headers={"Authorization": f"Bearer {MISTRAL_API_KEY}"},
+                    json=self._batch_payload(texts),
+                ) as response:
+                    response_data = await response.json()
+            if "choices" not in response_data:
+                return None
+            resumes = json.loads(response_data['choices'][0]['message']['content']).get("resumes")
+            if not isinstance(resumes, list) or len(resumes) != len(texts):
+                return None
+            return resumes
+        except Exception as e:
+            print(f"⚠️ Échec du résumé groupé, repli sur un appel par offre : {e}")
+            return None
+
+    async def _summarize_batches_async(self, batches):
+        """Lance tous les lots en parallèle, bornés par un sémaphore."""
+        semaphore = asyncio.Semaphore(self.MAX_WORKERS)
+        connector = aiohttp.TCPConnector(limit=32)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            return await asyncio.gather(
+                *(self._summarize_batch_async(session, semaphore, batch) for batch in batches)
+            )
+
+    def summarize_many(self, texts):
+        """Résume une liste de textes ; retourne les résumés (None par échec).
+
+        Les textes déjà en cache sont servis localement ; les autres sont
+        regroupés par SUMMARY_BATCH_SIZE et tous les lots partent en
+        parallèle via aiohttp, avec repli sur summarize_with_mistral si
+        une réponse groupée est invalide.
+        """
+        summaries = [self._cache_get(text) for text in texts]
+        pending = [i for i, resume in enumerate(summaries) if resume is None]
+        batches = [
+            pending[start:start + self.SUMMARY_BATCH_SIZE]
+            for start in range(0, len(pending), self.SUMMARY_BATCH_SIZE)
+        ]
+        if not batches:
+            return summaries
+
+        results = asyncio.run(
+            self._summarize_batches_async([[texts[i] for i in batch] for batch in batches])
+        )
+        for batch, resumes in zip(batches, results):
+            if resumes is not None:
+                for i, resume in zip(batch, resumes):
+                    summaries[i] = resume
+                    self._cache_put(texts[i], resume)
+            else:
+                for i in batch:
+                    summaries[i] = self.summarize_with_mistral(texts[i])
+        return summaries
+
     def run_scraper(self):
         """Exécute le scraping et stocke les données en base."""
         html_content = self.fetch_html()
@@ -135,38 +408,155 @@ class JobScraper:
             print("❌ Aucune offre trouvée.")
             return
 
-        for job in job_list:
-            job_url = job['url']
-            print(f"📌 Vérification de l'offre : {job_url}")
+        # Dédoublonnage en une seule requête Mongo au lieu d'un find_one par offre
+        urls = [job["url"] for job in job_list]
+        seen = {doc["url"] for doc in self.collection.find({"url": {"$in": urls}}, {"url": 1, "_id": 0})}
+        expired = sum(1 for job in job_list if job.get("skip"))
+        if expired:
+            print(f"⚠️ {expired} offre(s) expirée(s) ignorée(s).")
+        new_jobs = [job for job in job_list if job["url"] not in seen and not job.get("skip")]
+        if not new_jobs:
+            print("⚠️ Toutes les offres sont déjà dans la base de données.")
+            return
+        print(f"📌 {len(new_jobs)} nouvelle(s) offre(s) sur {len(job_list)} à traiter.")
 
-            if self.collection.find_one({"url": job_url}):
-                print("⚠️ Offre déjà existante dans la base de données. Ignorée.\n")
-                continue  
+        # Phase 1 : récupération parallèle du texte des offres
+        fetched = []
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            futures = {executor.submit(self._fetch_job_text, job): job for job in new_jobs}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                    if result:
+                        fetched.append(result)
+                except Exception as e:
+                    print(f"❌ Erreur lors du traitement de l'offre {futures[future]['url']} : {e}\n")
 
-            job_text = self.extract_full_text(job_url)
-            if not job_text:
-                print(f"❌ Impossible d'extraire le texte de l'offre : {job_url}")
-                continue  
+        # Phase 2 : résumés groupés (un appel Mistral par lot d'offres)
+        summaries = self.summarize_many([text for _, text, _ in fetched])
 
-            resumeAI = self.summarize_with_mistral(job_text)
+        completed = []
+        for (job, _, from_card), resumeAI in zip(fetched, summaries):
+            # Le chemin carte seule peut manquer de contexte : dans ce cas,
+            # repli sur le téléchargement complet de la page de l'offre
+            if from_card and not self._card_summary_ok(resumeAI):
+                print(f"📌 Carte insuffisante, téléchargement complet : {job['url']}")
+                job_text = self.extract_full_text(job['url'])
+                resumeAI = self.summarize_with_mistral(self._trim_offer_text(job_text)) if job_text else None
             if resumeAI is None:
-                print(f"❌ L'API Mistral a échoué, l'offre ne sera pas enregistrée : {job_url}\n")
-                continue  
+                print(f"❌ L'API Mistral a échoué, l'offre ne sera pas enregistrée : {job['url']}\n")
+                continue
+            completed.append((job, resumeAI))
+
+        if not completed:
+            print("⚠️ Aucune offre à enregistrer.")
+            return
 
-            job_entry = {
+        # Une seule requête d'insertion pour tout le lot ; ordered=False
+        # continue malgré les éventuels doublons (index unique sur url).
+        # Les documents sont générés à la volée, pas matérialisés en double.
+        now = datetime.now(timezone.utc)
+        entries = (
+            {
                 "title": job["title"],
                 "company": job["company"],
                 "location": job["location"],
-                "url": job_url,
+                "url": job["url"],
                 "resume": resumeAI,
-                "created_at": datetime.utcnow()
+                "created_at": now,
             }
+            for job, resumeAI in completed
+        )
+        try:
+            result = self.collection.insert_many(entries, ordered=False)
+            print(f"✅ {len(result.inserted_ids)} offre(s) enregistrée(s).\n")
+        except BulkWriteError as e:
+            inserted = e.details.get("nInserted", 0)
+            print(f"⚠️ {inserted} offre(s) enregistrée(s), doublons ignorés : {e.details.get('writeErrors', [])[:1]}\n")
+        except Exception as e:
+            print(f"❌ Erreur lors de l'enregistrement dans MongoDB : {e}\n")
+
+    def _card_text(self, job):
+        """Texte de résumé construit depuis la carte de la liste, ou None.
+
+        Quand la carte est assez renseignée, on tente le résumé sans
+        re-télécharger la page de l'offre ; le modèle doit répondre par un
+        marqueur dédié s'il manque de contexte, auquel cas run_scraper
+        retombe sur le téléchargement complet.
+        """
+        if (
+            len(job["title"]) > self.CARD_TITLE_MIN_LEN
+            and job["company"] != "N/A"
+            and job["location"] != "N/A"
+        ):
+            return (
+                f"{job['title']}\n{job['company']}\n{job['location']}\n"
+                f"(Si ces informations ne suffisent pas pour un résumé utile, "
+                f"réponds uniquement {self.CARD_SENTINEL}.)"
+            )
+        return None
+
+    def _card_summary_ok(self, resume):
+        """Vrai si un résumé issu du chemin carte seule est exploitable."""
+        return (
+            resume is not None
+            and self.CARD_SENTINEL not in resume
+            and len(resume) >= self.CARD_SUMMARY_MIN_LEN
+        )
+
+    def _fetch_job_text(self, job):
+        """Récupère le texte d'une offre ; retourne (job, texte, depuis_carte) ou None."""
+        job_url = job['url']
+        print(f"📌 Traitement de l'offre : {job_url}")
+
+        card_text = self._card_text(job)
+        if card_text:
+            return (job, card_text, True)
+
+        job_text = self.extract_full_text(job_url)
+        if not job_text:
+            print(f"❌ Impossible d'extraire le texte de l'offre : {job_url}")
+            return None
+        return (job, self._trim_offer_text(job_text), False)
+
+# Singleton paresseux : un seul JobScraper (et un seul pool Mongo) par
+# worker, que l'app tourne sous gunicorn ou via le serveur de dev
+_scraper = None
+_scraper_lock = threading.Lock()
+
+def get_scraper():
+    global _scraper
+    with _scraper_lock:
+        if _scraper is None:
+            _scraper = JobScraper(
+                url="https://www.mediacongo.net/emplois/",
+                mongo_uri=MONGO_URI,
+                db_name="job_database",
+                collection_name="jobs"
+            )
+    return _scraper
+
+# Un seul worker de scraping : les GET /scrape répétés ne multiplient plus
+# les parcours complets du site (et la dépense LLM) ; au plus un scrape en
+# cours et un en attente
+_scrape_queue = queue.Queue(maxsize=1)
+
+def _scrape_worker():
+    while True:
+        _scrape_queue.get()
+        try:
+            get_scraper().run_scraper()
+        except Exception as e:
+            print(f"❌ Erreur inattendue pendant le scraping : {e}")
+        finally:
+            _scrape_queue.task_done()
+
+threading.Thread(target=_scrape_worker, daemon=True).start()
 
-            try:
-                result = self.collection.insert_one(job_entry)
-                print(f"✅ Offre enregistrée : {job['title']} (ID: {result.inserted_id})\n")
-            except Exception as e:
-                print(f"❌ Erreur lors de l'enregistrement dans MongoDB : {e}\n")
+# Compteur du jour mis en cache 30 s pour ne pas interroger Mongo à chaque
+# appel de /scrape/status
+_status_lock = threading.Lock()
+_status_cache = {"checked_at": 0.0, "inserted_today": 0}
 
 @app.route("/")
 def home():
@@ -174,15 +564,28 @@ def home():
 
 @app.route("/scrape")
 def scrape():
-    threading.Thread(target=scraper.run_scraper).start()
-    return jsonify({"message": "Scraping started!"})
+    try:
+        _scrape_queue.put_nowait(1)
+        return jsonify({"status": "queued"})
+    except queue.Full:
+        return jsonify({"status": "already_running"})
+
+@app.route("/scrape/status")
+def scrape_status():
+    with _status_lock:
+        if time.monotonic() - _status_cache["checked_at"] > 30:
+            start_of_day = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+            _status_cache["inserted_today"] = get_scraper().collection.count_documents(
+                {"created_at": {"$gte": start_of_day}}
+            )
+            _status_cache["checked_at"] = time.monotonic()
+        inserted_today = _status_cache["inserted_today"]
+    return jsonify({
+        "queued": not _scrape_queue.empty(),
+        "inserted_today": inserted_today,
+    })
 
 if __name__ == "__main__":
-    scraper = JobScraper(
-        url="https://www.mediacongo.net/emplois/",
-        mongo_uri=MONGO_URI,
-        db_name="job_database",
-        collection_name="jobs"
-    )
+    # Serveur de développement uniquement ; en production, voir start.sh
     port = int(os.environ.get("PORT", 5000))
-    app.run(host="0.0.0.0", port=port, debug=True)
+    app.run(host="0.0.0.0", port=port, debug=bool(os.environ.get("FLASK_DEBUG")))
@@ -1 +1 @@
-gunicorn -w 1 -b 0.0.0.0:$PORT job_scraper:app
+gunicorn -k gthread -w 2 --threads 8 -b 0.0.0.0:$PORT job_scraper:app